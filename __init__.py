@@ -1,3 +1,3 @@
 """Forex Scalper Application Package."""
 
-__all__ = ["main", "gui", "strategies", "trading", "settings"]
+__all__ = ["main", "gui", "strategies", "trading", "settings", "history_cache"]
@@ -1,20 +1,60 @@
+import asyncio
+import functools
+import math
 import time
 import threading
 import tkinter as tk
-import queue
+from collections import deque
 from tkinter import ttk, messagebox, simpledialog
-from typing import List, Dict, Any # Added for type hinting
-import pandas as pd # Added for OHLC data handling
-from trading import Trader, AiAdvice, Position # adjust import path if needed
+from typing import List, Dict, Any, Optional # Added for type hinting
+from trading import Trader, AiAdvice, Position, OrderReq, ORDER_SIDE_BUY, ORDER_SIDE_SELL # adjust import path if needed
 from strategies import (
     SafeStrategy, ModerateStrategy, AggressiveStrategy,
-    MomentumStrategy, MeanReversionStrategy
+    MomentumStrategy, MeanReversionStrategy,
+    Decision, ACTION_NAMES, as_decision
 )
 from indicators import (
-    calculate_ema, calculate_atr, calculate_rsi, calculate_adx
+    calculate_adx,
+    calculate_ema_last, calculate_rsi_last, calculate_atr_last
 )
 from ttkthemes import ThemedTk
 
+_STRATEGY_MAP = {
+    "Safe": SafeStrategy, "Moderate": ModerateStrategy, "Aggressive": AggressiveStrategy,
+    "Momentum": MomentumStrategy, "Mean Reversion": MeanReversionStrategy
+}
+
+# Safety-net interval for the data readiness check; bar arrivals trigger it directly
+_READINESS_FALLBACK_S = 10.0
+
+# Longest the scalp loop sleeps without a tick; picks up history loads and mock mode, which send no ticks
+_SCALP_IDLE_TIMEOUT_S = 1.0
+
+# Signals handled in the same Tk idle pass are submitted together. The client sends at most
+# 5 messages per second, so waiting longer would only add latency; a batch of 5 is sent at once.
+_ORDER_BATCH_WINDOW_MS = 0
+_ORDER_BATCH_MAX = 5
+
+# How long the connect thread waits for account details after the client connects
+_ACCOUNT_READY_TIMEOUT_S = 15
+
+# Maximum number of lines kept in the TradingPage output log
+_MAX_LOG_LINES = 2000
+# Extra lines tolerated before trimming back down to _MAX_LOG_LINES
+_LOG_TRIM_SLACK = 200
+# Log lines are buffered and written to the widget in batches at this interval
+_LOG_FLUSH_MS = 100
+_LOG_BUFFER_MAX = 1000
+
+# Positions table: fixed pool of label rows, reused instead of a Treeview
+_POSITION_COLUMNS = ("id", "symbol", "side", "volume", "open_price", "pnl")
+_PNL_COLUMN = _POSITION_COLUMNS.index("pnl")
+_MAX_POSITION_ROWS = 50
+
+# Bound formatters for hot-path number formatting
+_F2 = "{:.2f}".format
+_F5 = "{:.5f}".format
+
 class MainApplication(ThemedTk):
     def __init__(self, settings):
         super().__init__(theme="arc")
@@ -25,15 +65,30 @@ class MainApplication(ThemedTk):
         self.columnconfigure(0, weight=1)
 
         self.settings = settings
-        self._ui_queue = queue.Queue()
+        # Single consumer (the Tk thread); deque.append/popleft are atomic in CPython,
+        # so producers on worker threads need no extra locking.
+        self._ui_queue = deque()
+        self._drain_scheduled = False
+        # Periodic jobs share one Tk timer: each entry is [interval_s, next_due, callback]
+        self._periodic_jobs = []
+        self._tick_id = None
         self.trader = Trader(
             self.settings,
             on_account_update=self._handle_account_update,
-            on_positions_update=self._handle_positions_update
+            on_positions_update=self._handle_positions_update,
+            on_bars_updated=self._handle_bars_update
         )
-        self.after(100, self._process_ui_queue)
 
 
+        # Shared status styles; switching a label's style is cheaper than re-parsing foreground options
+        style = ttk.Style(self)
+        style.configure("Ready.TLabel", foreground="green")
+        style.configure("Waiting.TLabel", foreground="orange")
+        style.configure("Error.TLabel", foreground="red")
+        style.configure("Idle.TLabel", foreground="gray")
+        style.configure("Profit.TLabel", foreground="green")
+        style.configure("Loss.TLabel", foreground="red")
+
         container = ttk.Frame(self)
         container.grid(row=0, column=0, sticky="nsew")
         container.rowconfigure(0, weight=1)
@@ -61,6 +116,7 @@ class MainApplication(ThemedTk):
         self.pages[PerformancePage] = self.performance_page
 
         self.show_page(SettingsPage)
+        self._schedule_tick()
 
     def show_page(self, page_cls):
         if page_cls in [TradingPage, PerformancePage]:
@@ -77,55 +133,89 @@ class MainApplication(ThemedTk):
             page = self.pages[page_cls]
             page.tkraise()
 
+    def register_periodic(self, interval_s: float, callback, first_delay_s: Optional[float] = None):
+        """Run callback every interval_s seconds from the shared tick instead of a separate after() chain."""
+        delay = interval_s if first_delay_s is None else first_delay_s
+        self._periodic_jobs.append([interval_s, time.monotonic() + delay, callback])
+        self._schedule_tick()
+
+    def _schedule_tick(self):
+        # Keep exactly one pending timer, aimed at the earliest due job.
+        if self._tick_id is not None:
+            self.after_cancel(self._tick_id)
+            self._tick_id = None
+        if not self._periodic_jobs:
+            return
+        next_due = min(job[1] for job in self._periodic_jobs)
+        delay_ms = max(0, int((next_due - time.monotonic()) * 1000))
+        self._tick_id = self.after(delay_ms, self._tick)
+
+    def _tick(self):
+        self._tick_id = None
+        now = time.monotonic()
+        for job in self._periodic_jobs:
+            if now >= job[1]:
+                job[1] = now + job[0]
+                job[2]()
+        self._schedule_tick()
+
     def _handle_account_update(self, summary: Dict[str, Any]):
         """Callback for the Trader to push account updates."""
-        self._ui_queue.put(("account_update", summary))
+        self._enqueue_ui(self._apply_account_update, summary)
 
     def _handle_positions_update(self, positions: Dict[int, Position]):
         """Callback for the Trader to push position updates."""
-        self._ui_queue.put(("positions_update", positions))
+        self._enqueue_ui(self.performance_page.update_positions, positions)
+
+    def _handle_bars_update(self, symbol: str):
+        """Callback for the Trader to signal new OHLC bars for a symbol."""
+        # Filter here so updates for other symbols can't coalesce away the selected one's
+        if symbol == self.trading_page._symbol_normalized:
+            self._enqueue_ui(self._apply_bars_update, symbol)
+
+    def _enqueue_ui(self, handler, payload: Any):
+        """Queue handler(payload) for the Tk thread and make sure a drain is pending.
+        Safe to call from worker threads. Payloads are snapshots, so a drain only calls each
+        handler with its newest payload; one-off calls that must all run (logs, trades) go
+        through after(0, ...) instead."""
+        self._ui_queue.append((handler, payload))
+        self._schedule_drain()
+
+    def _schedule_drain(self):
+        # Multiple enqueues before the drain runs coalesce into a single idle callback.
+        # Tkinter marshals after_idle from worker threads onto the Tk thread.
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.after_idle(self._process_ui_queue)
 
     def _process_ui_queue(self):
         """Process items from the UI queue."""
-        try:
-            while True:
-                msg_type, data = self._ui_queue.get_nowait()
-
-                trading_page = self.pages.get(TradingPage)
-                performance_page = self.pages.get(PerformancePage)
-
-                if msg_type == "account_update":
-                    for page in self.pages.values():
-                        if hasattr(page, "update_account_info"):
-                            page.update_account_info(
-                                account_id=data.get("account_id", "–"),
-                                balance=data.get("balance"),
-                                equity=data.get("equity"),
-                                margin=data.get("margin")
-                            )
-                elif msg_type == "positions_update":
-                    if performance_page and hasattr(performance_page, "update_positions"):
-                        performance_page.update_positions(data)
-                elif msg_type == "show_ai_advice":
-                    if trading_page:
-                        trading_page._show_ai_advice(data)
-                elif msg_type == "show_ai_error":
-                    if trading_page:
-                        trading_page._show_ai_error(data)
-                elif msg_type == "re-enable_ai_button":
-                    if trading_page:
-                        trading_page.ai_button.config(state="normal")
-                elif msg_type == "_log":
-                    if trading_page:
-                        trading_page._log(data)
-                elif msg_type == "_execute_trade":
-                    if trading_page:
-                        trading_page._execute_trade(*data)
-
-        except queue.Empty:
-            pass
-        finally:
-            self.after(100, self._process_ui_queue)
+        # Clear the flag before draining so a message enqueued mid-drain schedules a new pass.
+        self._drain_scheduled = False
+
+        latest = {}
+        ui_queue = self._ui_queue
+        while ui_queue:
+            handler, payload = ui_queue.popleft()
+            latest[handler] = payload
+
+        for handler, payload in latest.items():
+            handler(payload)
+
+    def _apply_account_update(self, summary: Dict[str, Any]):
+        for page in self.pages.values():
+            if hasattr(page, "update_account_info"):
+                page.update_account_info(
+                    account_id=summary.get("account_id", "–"),
+                    balance=summary.get("balance"),
+                    equity=summary.get("equity"),
+                    margin=summary.get("margin")
+                )
+
+    def _apply_bars_update(self, symbol: str):
+        # The selection may have changed while the message was queued
+        if symbol == self.trading_page._symbol_normalized:
+            self.trading_page._update_data_readiness_on_bars()
 
 
 class SettingsPage(ttk.Frame):
@@ -216,67 +306,66 @@ class SettingsPage(ttk.Frame):
 
         self.status = ttk.Label(bottom_row, text="Disconnected", anchor="center")
         self.status.pack(side="top", fill="x", expand=True, pady=(5,0))
+        self._connect_attempt = 0 # Lets a late account-ready from an old attempt be ignored
 
     def update_account_info(self, account_id: str, balance: float | None, equity: float | None, margin: float | None):
         self.account_id_var.set(str(account_id) if account_id is not None else "–")
-        self.balance_var.set(f"{balance:.2f}" if balance is not None else "–")
-        self.equity_var.set(f"{equity:.2f}" if equity is not None else "–")
-        self.margin_var.set(f"{margin:.2f}" if margin is not None else "–")
+        self.balance_var.set(_F2(balance) if balance is not None else "–")
+        self.equity_var.set(_F2(equity) if equity is not None else "–")
+        self.margin_var.set(_F2(margin) if margin is not None else "–")
 
     def save_settings(self):
-        self.controller.settings.openapi.client_id = self.client_id_var.get()
-        self.controller.settings.openapi.client_secret = self.client_secret_var.get()
-        self.controller.settings.ai.advisor_auth_token = self.advisor_auth_token_var.get()
+        s = self.controller.settings
+        api, ai, gen = s.openapi, s.ai, s.general
+        api.client_id = self.client_id_var.get()
+        api.client_secret = self.client_secret_var.get()
+        ai.advisor_auth_token = self.advisor_auth_token_var.get()
         try:
-            self.controller.settings.general.trading_start_hour = int(self.start_hour_var.get())
-            self.controller.settings.general.trading_end_hour = int(self.end_hour_var.get())
-            self.controller.settings.openapi.default_ctid_trader_account_id = int(self.account_id_entry_var.get())
+            gen.trading_start_hour = int(self.start_hour_var.get())
+            gen.trading_end_hour = int(self.end_hour_var.get())
+            api.default_ctid_trader_account_id = int(self.account_id_entry_var.get())
         except (ValueError, TypeError):
-            self.controller.settings.openapi.default_ctid_trader_account_id = None
+            api.default_ctid_trader_account_id = None
             messagebox.showerror("Invalid Input", "Trading hours and Account ID must be valid integers.")
 
-        self._log(f"[Settings] Saving start hour: {self.controller.settings.general.trading_start_hour}")
-        self._log(f"[Settings] Saving end hour: {self.controller.settings.general.trading_end_hour}")
+        self._log_to_trading_page(f"[Settings] Saving start hour: {gen.trading_start_hour}")
+        self._log_to_trading_page(f"[Settings] Saving end hour: {gen.trading_end_hour}")
 
-        self.controller.settings.save()
+        s.save()
         messagebox.showinfo("Settings Saved", "Your settings have been saved successfully.")
 
     def attempt_connection(self):
         t = self.controller.trader
         t.settings = self.controller.settings
-        self.status.config(text="Processing connection...", foreground="orange")
+        self.status.config(text="Processing connection...", style="Waiting.TLabel")
+
+        self._connect_attempt += 1
+        attempt = self._connect_attempt
 
         def _connect_thread_target():
-            if t.connect():
-                self.after(0, lambda: self.status.config(text="Connection successful. Authenticating account...", foreground="orange"))
-                self.after(100, self._check_connection)
-            else:
+            if not t.connect():
                 _, msg = t.get_connection_status()
-                final_msg = f"Failed: {msg}" if msg else "Connection failed."
-                self.after(0, lambda: messagebox.showerror("Connection Failed", final_msg))
-                self.after(0, lambda: self.status.config(text=final_msg, foreground="red"))
+                self._report_connection_failure(f"Failed: {msg}" if msg else "Connection failed.")
+                return
+            self.after(0, lambda: self.status.config(text="Connection successful. Authenticating account...", style="Waiting.TLabel"))
+            # Returns early with False when setup fails or the connection drops
+            if t.wait_for_account_ready(timeout=_ACCOUNT_READY_TIMEOUT_S):
+                self.after(0, self._on_successful_connection, t)
+                return
+            _, msg = t.get_connection_status()
+            self._report_connection_failure(f"Failed: {msg}" if msg else "Timed out waiting for account details.")
+            # The account may still arrive after the timeout; finish connecting if no newer attempt started
+            if t.wait_for_account_ready() and attempt == self._connect_attempt:
+                self.after(0, self._on_successful_connection, t)
         threading.Thread(target=_connect_thread_target, daemon=True).start()
-        
-    def _check_connection(self):
-        t = self.controller.trader
-        connected, msg = t.get_connection_status()
-        if connected:
-            self._on_successful_connection(t)
-        else:
-            if msg:
-                messagebox.showerror("Connection Failed", msg)
-                self.status.config(text=f"Failed: {msg}", foreground="red")
-            else:
-                self.after(200, self._check_connection)
+
+    def _report_connection_failure(self, final_msg: str):
+        # Called from the connect thread
+        self.after(0, lambda: messagebox.showerror("Connection Failed", final_msg))
+        self.after(0, lambda: self.status.config(text=final_msg, style="Error.TLabel"))
 
     def _on_successful_connection(self, t):
         summary = t.get_account_summary()
-        account_id_from_summary = summary.get("account_id")
-        if account_id_from_summary in ["connecting...", "–", None] or summary.get("balance") is None:
-            self.status.config(text="Fetching account details...", foreground="orange")
-            self.after(300, lambda: self._on_successful_connection(t))
-            return
-        
         self.update_account_info(
             summary.get("account_id"),
             summary.get("balance"),
@@ -284,7 +373,7 @@ class SettingsPage(ttk.Frame):
             summary.get("margin")
         )
         messagebox.showinfo("Connected", f"Successfully connected to account {summary.get('account_id')}")
-        self.status.config(text="Connected ✅", foreground="green")
+        self.status.config(text="Connected ✅", style="Ready.TLabel")
 
         available_symbols = t.get_available_symbol_names()
         if available_symbols:
@@ -307,47 +396,91 @@ class PerformancePage(ttk.Frame):
         self.rowconfigure(0, weight=1)
         self.columnconfigure(0, weight=1)
 
-        columns = ("id", "symbol", "side", "volume", "open_price", "pnl")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings")
-        self.tree.grid(row=0, column=0, sticky="nsew")
-
-        for col in columns:
-            self.tree.heading(col, text=col.replace("_", " ").title())
-        self.tree.column("pnl", anchor="e")
-        self.tree.bind("<Double-1>", self._on_trade_double_click)
-
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        # A scalping session only has a handful of positions but updates them every tick.
+        # Pre-created labels bound to StringVars are much cheaper to refresh than Treeview items.
+        table = ttk.Frame(self)
+        table.grid(row=0, column=0, sticky="new")
+        for col_idx, col in enumerate(_POSITION_COLUMNS):
+            table.columnconfigure(col_idx, weight=1)
+            ttk.Label(table, text=col.replace("_", " ").title(), font=("TkDefaultFont", 9, "bold")).grid(
+                row=0, column=col_idx, sticky="w", padx=(0, 10))
+
+        self._row_vars: List[List[tk.StringVar]] = []
+        self._row_labels: List[List[ttk.Label]] = []
+        for row_idx in range(_MAX_POSITION_ROWS):
+            row_vars = [tk.StringVar() for _ in _POSITION_COLUMNS]
+            row_labels = []
+            for col_idx, var in enumerate(row_vars):
+                lbl = ttk.Label(table, textvariable=var, anchor="e" if col_idx == _PNL_COLUMN else "w")
+                lbl.grid(row=row_idx + 1, column=col_idx, sticky="ew", padx=(0, 10))
+                lbl.grid_remove()
+                lbl.bind("<Double-1>", lambda e, r=row_idx: self._on_trade_double_click(r))
+                row_labels.append(lbl)
+            self._row_vars.append(row_vars)
+            self._row_labels.append(row_labels)
+
+        self._row_pos_ids: List[Optional[int]] = [None] * _MAX_POSITION_ROWS
+        self._row_cache: List[Optional[tuple]] = [None] * _MAX_POSITION_ROWS # raw values shown per row
+        self._row_text: List[List[str]] = [[""] * len(_POSITION_COLUMNS) for _ in range(_MAX_POSITION_ROWS)]
+        self._row_profit: List[Optional[bool]] = [None] * _MAX_POSITION_ROWS
+        self._visible_rows = 0
+
+        self.overflow_var = tk.StringVar(value="")
+        self._overflow_text = ""
+        ttk.Label(self, textvariable=self.overflow_var).grid(row=1, column=0, sticky="w")
 
         close_all_button = ttk.Button(self, text="Close All Positions", command=self.trader.close_all_positions)
-        close_all_button.grid(row=1, column=0, columnspan=2, pady=(10, 0))
+        close_all_button.grid(row=2, column=0, pady=(10, 0))
 
-    def _on_trade_double_click(self, event):
-        selection = self.tree.selection()
-        if not selection: return
-        item_id = selection[0]
-        position_id_to_close = int(self.tree.item(item_id, "values")[0])
+    def _on_trade_double_click(self, row_idx: int):
+        position_id_to_close = self._row_pos_ids[row_idx]
+        if position_id_to_close is None: return
         if messagebox.askyesno("Confirm Close", f"Are you sure you want to close position {position_id_to_close}?"):
             self.trader.close_position(position_id_to_close)
 
     def update_positions(self, open_positions: Dict[int, Position]):
-        current_ids_in_tree = set(self.tree.get_children())
-        for pos_id, pos_data in open_positions.items():
-            item_id = str(pos_id)
-            pnl_color = "green" if pos_data.current_pnl >= 0 else "red"
-            self.tree.tag_configure(pnl_color, foreground=pnl_color)
-            values = (
-                pos_id, pos_data.symbol_name, pos_data.trade_side,
-                f"{pos_data.volume_lots:.2f}", f"{pos_data.open_price:.5f}", f"{pos_data.current_pnl:.2f}"
+        positions = sorted(open_positions.items())
+        shown = positions[:_MAX_POSITION_ROWS]
+
+        for row_idx, (pos_id, pos_data) in enumerate(shown):
+            key = (pos_id, pos_data.symbol_name, pos_data.trade_side, pos_data.volume_lots, pos_data.open_price, pos_data.current_pnl)
+            if self._row_cache[row_idx] == key:
+                continue
+            self._row_cache[row_idx] = key
+            self._row_pos_ids[row_idx] = pos_id
+
+            texts = (
+                str(pos_id), pos_data.symbol_name, pos_data.trade_side,
+                _F2(pos_data.volume_lots), _F5(pos_data.open_price), _F2(pos_data.current_pnl)
             )
-            if item_id in current_ids_in_tree:
-                self.tree.item(item_id, values=values, tags=(pnl_color,))
-                current_ids_in_tree.remove(item_id)
-            else:
-                self.tree.insert("", "end", iid=item_id, values=values, tags=(pnl_color,))
-        for item_id_to_remove in current_ids_in_tree:
-            self.tree.delete(item_id_to_remove)
+            # Only touch the StringVars whose text actually changed
+            row_text, row_vars = self._row_text[row_idx], self._row_vars[row_idx]
+            for col_idx, text in enumerate(texts):
+                if row_text[col_idx] != text:
+                    row_text[col_idx] = text
+                    row_vars[col_idx].set(text)
+
+            is_profit = pos_data.current_pnl >= 0
+            if self._row_profit[row_idx] != is_profit:
+                self._row_profit[row_idx] = is_profit
+                self._row_labels[row_idx][_PNL_COLUMN].configure(style="Profit.TLabel" if is_profit else "Loss.TLabel")
+
+        # Show newly used rows and hide rows that are no longer needed
+        for row_idx in range(self._visible_rows, len(shown)):
+            for lbl in self._row_labels[row_idx]:
+                lbl.grid()
+        for row_idx in range(len(shown), self._visible_rows):
+            for lbl in self._row_labels[row_idx]:
+                lbl.grid_remove()
+            self._row_cache[row_idx] = None
+            self._row_pos_ids[row_idx] = None
+        self._visible_rows = len(shown)
+
+        hidden = len(positions) - len(shown)
+        overflow_text = f"+{hidden} more positions not shown" if hidden > 0 else ""
+        if self._overflow_text != overflow_text:
+            self._overflow_text = overflow_text
+            self.overflow_var.set(overflow_text)
 
 
 class TradingPage(ttk.Frame):
@@ -356,7 +489,7 @@ class TradingPage(ttk.Frame):
         self.controller = controller
         self.trader = controller.trader
         self.is_scalping = False
-        self.scalping_thread = None
+        self._scalp_future = None
 
         self.account_id_var_tp = tk.StringVar(value="–")
         self.balance_var_tp = tk.StringVar(value="–")
@@ -383,7 +516,9 @@ class TradingPage(ttk.Frame):
         self.symbol_var = tk.StringVar(value="Loading symbols...")
         self.cb_symbol = ttk.Combobox(self, textvariable=self.symbol_var, values=[], state="readonly")
         self.cb_symbol.grid(row=2, column=1, sticky="ew")
-        self.cb_symbol.bind("<<ComboboxSelected>>", lambda e: self.trader.handle_symbol_selection(self.symbol_var.get()))
+        self.cb_symbol.bind("<<ComboboxSelected>>", self._on_symbol_selected)
+        self._symbol_normalized = "" # symbol_var without "/", refreshed whenever the selection changes
+        self._last_symbols: Optional[tuple] = None # last list pushed into cb_symbol's values
 
         ttk.Label(self, text="Price:").grid(row=3, column=0, sticky="w", padx=(0,5))
         self.price_var = tk.StringVar(value="–")
@@ -409,10 +544,10 @@ class TradingPage(ttk.Frame):
 
         ttk.Label(self, text="Strategy:").grid(row=8, column=0, sticky="w", padx=(0,5))
         self.strategy_var = tk.StringVar(value="Safe")
-        strategy_names = ["Safe", "Moderate", "Aggressive", "Momentum", "Mean Reversion"]
+        strategy_names = list(_STRATEGY_MAP)
         cb_strat = ttk.Combobox(self, textvariable=self.strategy_var, values=strategy_names, state="readonly")
         cb_strat.grid(row=8, column=1, sticky="ew")
-        cb_strat.bind("<<ComboboxSelected>>", lambda e: self._update_data_readiness_display(execute_now=True))
+        cb_strat.bind("<<ComboboxSelected>>", lambda e: self._update_data_readiness_display())
 
         ttk.Label(self, text="Data Readiness:").grid(row=9, column=0, sticky="w", padx=(0,5), pady=(10,0))
         self.data_readiness_var = tk.StringVar(value="Initializing...")
@@ -448,35 +583,55 @@ class TradingPage(ttk.Frame):
 
         self.total_pnl, self.total_trades, self.wins, self.current_batch_trades, self.batch_start_equity = 0.0, 0, 0, 0, 0.0
         self.batch_size = 5
-        self.after(1000, self._update_data_readiness_display)
-
-    def _update_data_readiness_display(self, execute_now=False):
-        if not self.trader or not self.trader.is_connected:
+        self._log_buf = deque(maxlen=_LOG_BUFFER_MAX) # Pending log lines; oldest dropped if a flush falls behind
+        self._log_flush_scheduled = False
+        self._batch_target = 0.0
+        self._pending_orders: List[OrderReq] = []
+        self._flush_timer = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None # Runs the scalp coroutines, started on first use
+        self._strategy_cache: Dict[str, tuple] = {} # strategy name -> (instance, required bars map)
+        self._last_readiness_key = None
+        self._last_bars_refresh = 0.0 # time.monotonic() of the last bar-driven readiness refresh
+        controller.register_periodic(_READINESS_FALLBACK_S, self._readiness_fallback_tick, first_delay_s=1.0)
+
+    def _update_data_readiness_on_bars(self):
+        self._last_bars_refresh = time.monotonic()
+        self._update_data_readiness_display()
+
+    def _readiness_fallback_tick(self):
+        # Only needed when no bars were pushed for the selected symbol during the last interval
+        if time.monotonic() - self._last_bars_refresh >= _READINESS_FALLBACK_S:
+            self._update_data_readiness_display()
+
+    def _update_data_readiness_display(self):
+        trader = self.trader
+        if not trader or not trader.is_connected:
             self.data_readiness_var.set("Trader disconnected")
-            self.data_readiness_label.config(foreground="gray")
+            self.data_readiness_label.config(style="Idle.TLabel")
             self.start_button.config(state="disabled")
-            if not execute_now: self.after(2000, self._update_data_readiness_display)
             return
 
         strategy_name = self.strategy_var.get()
-        # This is a bit inefficient, but safe. Could be optimized by caching.
-        strategy_map = {
-            "Safe": SafeStrategy, "Moderate": ModerateStrategy, "Aggressive": AggressiveStrategy,
-            "Momentum": MomentumStrategy, "Mean Reversion": MeanReversionStrategy
-        }
-        strategy_class = strategy_map.get(strategy_name)
+        strategy_class = _STRATEGY_MAP.get(strategy_name)
         if not strategy_class:
             self.data_readiness_var.set("Select a strategy")
             self.start_button.config(state="disabled")
-            if not execute_now: self.after(1000, self._update_data_readiness_display)
             return
 
-        strategy_instance = strategy_class(self.controller.settings)
-        required_bars_map = strategy_instance.get_required_bars()
-        symbol = self.symbol_var.get().replace("/", "")
-        available_bars_map = self.trader.get_ohlc_bar_counts(symbol)
-
-        self._log(f"[DataReadiness] Checking for {symbol}. Required: {required_bars_map}. Available: {available_bars_map}")
+        cached = self._strategy_cache.get(strategy_name)
+        if cached is None:
+            strategy_instance = strategy_class(self.controller.settings)
+            cached = (strategy_instance, strategy_instance.get_required_bars())
+            self._strategy_cache[strategy_name] = cached
+        required_bars_map = cached[1]
+        symbol = self._symbol_normalized
+        available_bars_map = trader.get_ohlc_bar_counts(symbol)
+
+        # Only log when something changed, otherwise every tick appends an identical line.
+        readiness_key = (symbol, required_bars_map, available_bars_map)
+        if readiness_key != self._last_readiness_key:
+            self._last_readiness_key = readiness_key
+            self._log(f"[DataReadiness] Checking for {symbol}. Required: {required_bars_map}. Available: {available_bars_map}")
 
         all_ready = True
         status_messages = []
@@ -491,33 +646,44 @@ class TradingPage(ttk.Frame):
         final_status_text = ", ".join(status_messages)
         if all_ready:
             final_status_text += " (Ready)"
-            self.data_readiness_label.config(foreground="green")
+            self.data_readiness_label.config(style="Ready.TLabel")
             self.start_button.config(state="normal" if not self.is_scalping else "disabled")
         else:
             final_status_text += " (Waiting...)"
-            self.data_readiness_label.config(foreground="orange")
+            self.data_readiness_label.config(style="Waiting.TLabel")
             self.start_button.config(state="disabled")
 
         self.data_readiness_var.set(final_status_text)
-        if not execute_now: self.after(2000, self._update_data_readiness_display)
 
     def populate_symbols_dropdown(self, symbol_names: List[str]):
+        # Re-marshalling a few thousand symbols into a Tcl list is wasted work when nothing changed
+        symbols = tuple(symbol_names)
+        if symbols != self._last_symbols:
+            self.cb_symbol.config(values=symbol_names)
+            self._last_symbols = symbols
         if not symbol_names:
-            self.cb_symbol.config(values=[])
             self.symbol_var.set("No symbols available")
+            self._symbol_normalized = ""
             return
-        self.cb_symbol.config(values=symbol_names)
         configured_default = self.controller.settings.general.default_symbol
         if configured_default in symbol_names:
             self.symbol_var.set(configured_default)
         elif symbol_names:
             self.symbol_var.set(symbol_names[0])
-        self.trader.handle_symbol_selection(self.symbol_var.get())
+        self._on_symbol_selected()
+
+    def _on_symbol_selected(self, event=None):
+        selected = self.symbol_var.get()
+        self._symbol_normalized = selected.replace("/", "")
+        self.trader.handle_symbol_selection(selected)
+        self._update_data_readiness_display()
 
     def update_account_info(self, account_id: str, balance: float | None, equity: float | None, margin: float | None):
+        if equity is not None:
+            self._check_batch_target(equity)
         self.account_id_var_tp.set(str(account_id) if account_id is not None else "–")
-        self.balance_var_tp.set(f"{balance:.2f}" if balance is not None else "–")
-        self.equity_var_tp.set(f"{equity:.2f}" if equity is not None else "–")
+        self.balance_var_tp.set(_F2(balance) if balance is not None else "–")
+        self.equity_var_tp.set(_F2(equity) if equity is not None else "–")
 
     def run_chatgpt_analysis(self):
         self._log("Requesting ChatGPT Analysis...")
@@ -525,24 +691,34 @@ class TradingPage(ttk.Frame):
         threading.Thread(target=self._chatgpt_analysis_thread, daemon=True).start()
 
     def _chatgpt_analysis_thread(self):
+        trader = self.trader
+        after = self.controller.after
         try:
-            symbol = self.symbol_var.get().replace("/", "")
-            price = self.trader.get_market_price(symbol)
-            ohlc_1m_df = self.trader.ohlc_history.get(symbol, {}).get('1m', pd.DataFrame())
-            if price is None or ohlc_1m_df.empty:
-                self.controller._ui_queue.put(("show_ai_error", "Could not perform analysis: Market data is missing."))
+            symbol = self._symbol_normalized
+            price = trader.get_market_price(symbol)
+            sym_hist = trader.ohlc_history.get(symbol)
+            bars_1m = sym_hist.get('1m') if sym_hist is not None else None
+            if price is None or bars_1m is None or bars_1m.empty:
+                after(0, self._show_ai_error, "Could not perform analysis: Market data is missing.")
                 return
 
-            features = { "price_bid": price, "ema_fast": calculate_ema(ohlc_1m_df, 9).iloc[-1], "ema_slow": calculate_ema(ohlc_1m_df, 21).iloc[-1], "rsi": calculate_rsi(ohlc_1m_df, 14).iloc[-1], "atr": calculate_atr(ohlc_1m_df, 14).iloc[-1], "spread_pips": 0 }
+            high, low, close = bars_1m.hlc()
+            features = { "price_bid": price, "ema_fast": calculate_ema_last(close, 9), "ema_slow": calculate_ema_last(close, 21), "rsi": calculate_rsi_last(close, 14), "atr": calculate_atr_last(high, low, close, 14), "spread_pips": 0 }
+            if any(math.isnan(v) for v in features.values()):
+                after(0, self._show_ai_error, "Could not perform analysis: Not enough bar data yet.")
+                return
             bot_proposal = { "side": "n/a", "sl_pips": self.sl_var.get(), "tp_pips": self.tp_var.get() }
-            advice = self.trader.get_ai_advice(symbol, "long", features, bot_proposal)
+            advice = trader.get_ai_advice(symbol, "long", features, bot_proposal)
 
-            if advice: self.controller._ui_queue.put(("show_ai_advice", advice))
-            else: self.controller._ui_queue.put(("show_ai_error", "Failed to get advice from the AI Overseer."))
+            if advice: after(0, self._show_ai_advice, advice)
+            else: after(0, self._show_ai_error, "Failed to get advice from the AI Overseer.")
         except Exception as e:
-            self.controller._ui_queue.put(("show_ai_error", f"An error occurred during analysis: {e}"))
+            after(0, self._show_ai_error, f"An error occurred during analysis: {e}")
         finally:
-            self.controller._ui_queue.put(("re-enable_ai_button", None))
+            after(0, self._reenable_ai_button)
+
+    def _reenable_ai_button(self):
+        self.ai_button.config(state="normal")
 
     def _show_ai_advice(self, advice: AiAdvice):
         self._log(f"ChatGPT Analysis Result: {advice.action.upper()} (Conf: {advice.confidence:.2%}) - {advice.reason}")
@@ -554,8 +730,7 @@ class TradingPage(ttk.Frame):
 
     def start_scalping(self):
         strategy_name = self.strategy_var.get()
-        strategy_map = { "Safe": SafeStrategy, "Moderate": ModerateStrategy, "Aggressive": AggressiveStrategy, "Momentum": MomentumStrategy, "Mean Reversion": MeanReversionStrategy }
-        strategy_class = strategy_map.get(strategy_name)
+        strategy_class = _STRATEGY_MAP.get(strategy_name)
         if not strategy_class:
             messagebox.showerror("Error", "Could not create the selected strategy.")
             return
@@ -563,19 +738,26 @@ class TradingPage(ttk.Frame):
         strategy = strategy_class(self.controller.settings)
         self._log(f"Strategy created: {strategy.NAME}")
 
-        symbol, tp, sl, size, batch_target = self.symbol_var.get().replace("/", ""), self.tp_var.get(), self.sl_var.get(), self.size_var.get(), self.batch_profit_var.get()
+        symbol, tp, sl, size, batch_target = self._symbol_normalized, self.tp_var.get(), self.sl_var.get(), self.size_var.get(), self.batch_profit_var.get()
         summary = self.trader.get_account_summary()
         self.batch_start_equity = summary.get("equity", 0.0) or 0.0
+        self._batch_target = batch_target
         self.current_batch_trades = 0
 
         self._toggle_scalping_ui(True)
-        self.scalping_thread = threading.Thread(target=self._scalp_loop, args=(symbol, tp, sl, size, strategy, batch_target), daemon=True)
-        self.scalping_thread.start()
-        messagebox.showinfo("Scalping Started", f"Live scalping thread started for {symbol}")
+        # The GUI size and default TP/SL are fixed for the session, so bind them into the order path once
+        execute = functools.partial(self._execute_trade, size=size, default_tp=tp, default_sl=sl)
+        self._scalp_future = asyncio.run_coroutine_threadsafe(
+            self._scalp_loop_async(symbol, strategy, execute), self._get_async_loop()
+        )
+        self._scalp_future.add_done_callback(self._on_scalp_loop_done)
+        messagebox.showinfo("Scalping Started", f"Live scalping started for {symbol}")
 
     def stop_scalping(self):
         if self.is_scalping:
             self._toggle_scalping_ui(False)
+            if self._scalp_future: self._scalp_future.cancel() # Interrupts the tick wait immediately
+            self._discard_pending_orders() # Queued signals must not open positions after the close-all
             try: self.trader.close_all_positions()
             except Exception as e: self._log(f"Error closing positions: {e}")
 
@@ -584,59 +766,161 @@ class TradingPage(ttk.Frame):
         self.start_button.config(state="disabled" if on else "normal")
         self.stop_button.config(state="normal" if on else "disabled")
 
-    def _scalp_loop(self, symbol: str, tp: float, sl: float, size: float, strategy, batch_target: float):
-        while self.is_scalping:
-            if self.current_batch_trades >= self.batch_size:
-                summary = self.trader.get_account_summary()
-                equity = summary.get("equity", 0.0) or 0.0
-                if equity - self.batch_start_equity >= batch_target:
-                    self.controller._ui_queue.put(("_log", "Batch profit target reached. Closing positions."))
-                    try: self.trader.close_all_positions()
-                    except Exception as e: self.controller._ui_queue.put(("_log", f"Error closing positions: {e}"))
-                    self.batch_start_equity = equity
-                    self.current_batch_trades = 0
-            
-            current_tick_price = self.trader.get_market_price(symbol)
-            if current_tick_price is None:
-                time.sleep(1)
-                continue
-
-            ohlc_data = {
-                '1m': self.trader.ohlc_history.get(symbol, {}).get('1m', pd.DataFrame()),
-                '15s': self.trader.ohlc_history.get(symbol, {}).get('15s', pd.DataFrame())
-            }
-            action_details = strategy.decide(symbol, {**ohlc_data, 'current_equity': self.trader.equity, 'current_price_tick': current_tick_price}, self.trader)
-
-            if action_details and isinstance(action_details, dict):
-                trade_action = action_details.get('action')
-                if trade_action in ("buy", "sell"):
-                    self.controller._ui_queue.put(("_log", f"Strategy signal: {trade_action.upper()} for {symbol}."))
-                    self.controller._ui_queue.put(("_execute_trade", (trade_action, symbol, current_tick_price, size, tp, sl, action_details.get('sl_offset'), action_details.get('tp_offset'), action_details.get('comment', ''))))
-            time.sleep(1)
-   
-    def _execute_trade(self, side: str, symbol: str, price: float, size: float, tp_pips_gui: float, sl_pips_gui: float, sl_offset_strategy: float | None, tp_offset_strategy: float | None, strategy_comment: str):
-        if price is None:
-            self._log("Trade execution skipped: Market price is unavailable.")
+    def _check_batch_target(self, equity: float):
+        """Closes the batch once it has enough trades and its profit target is met.
+        Runs on each pushed account update, the only time equity changes."""
+        if not self.is_scalping or self.current_batch_trades < self.batch_size:
             return
+        if equity - self.batch_start_equity >= self._batch_target:
+            self._log("Batch profit target reached. Closing positions.")
+            try: self.trader.close_all_positions()
+            except Exception as e: self._log(f"Error closing positions: {e}")
+            self.batch_start_equity = equity
+            self.current_batch_trades = 0
+
+    def _get_async_loop(self) -> asyncio.AbstractEventLoop:
+        if self._async_loop is None:
+            self._async_loop = asyncio.new_event_loop()
+            threading.Thread(target=self._async_loop.run_forever, daemon=True).start()
+        return self._async_loop
 
-        final_tp_pips = tp_offset_strategy if tp_offset_strategy is not None else tp_pips_gui
-        final_sl_pips = sl_offset_strategy if sl_offset_strategy is not None else sl_pips_gui
+    def _on_scalp_loop_done(self, future):
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            self.controller.after(0, self._log, f"Scalping loop stopped with error: {exc}")
+            if future is self._scalp_future: # A newer session may already be running
+                self.controller.after(0, self._toggle_scalping_ui, False)
+
+    async def _scalp_loop_async(self, symbol: str, strategy, execute_trade):
+        # Run the strategy when a tick for this symbol arrives; the batch target is checked on
+        # account updates instead (see _check_batch_target).
+        loop = asyncio.get_running_loop()
+        tick_event = asyncio.Event()
+        def on_tick(tick_symbol: str, _price: float):
+            # Called on the reactor thread
+            if tick_symbol == symbol:
+                loop.call_soon_threadsafe(tick_event.set)
+        trader = self.trader
+        trader.register_tick_callback(on_tick)
+
+        # Invariants bound to locals once; the loop body runs on every tick
+        after = self.controller.after
+        log = self._log
+        get_price = trader.get_market_price
+        decide = strategy.decide
+        tick_sensitive = strategy.tick_sensitive
+        uses_frames = strategy.uses_frames
+        wait_for, wait_tick, clear_tick = asyncio.wait_for, tick_event.wait, tick_event.clear
+        run_in_executor = loop.run_in_executor
+
+        # The per-symbol bar buffers are stable, so look them up once and reuse one context dict
+        symbol_hist = trader.get_symbol_history(symbol)
+        bars_1m, bars_15s = symbol_hist['1m'], symbol_hist['15s']
+        # Only new bars on the timeframes the strategy asks for can change its decision
+        watched = [symbol_hist[tf] for tf in strategy.get_required_bars() if tf in symbol_hist] or list(symbol_hist.values())
+        bars_seen = None
+        ctx = {'1m': None, '15s': None, 'ohlc_1m_hlc': None, 'current_equity': 0.0, 'current_price_tick': 0.0}
+        try:
+            while self.is_scalping:
+                current_tick_price = get_price(symbol)
+                # Unchanged buffer versions mean the strategy would see exactly the same bars as last time
+                bars_version = tuple([bars.version for bars in watched])
+                bars_changed = bars_version != bars_seen
+                if current_tick_price is not None and (bars_changed or tick_sensitive):
+                    if bars_changed:
+                        bars_seen = bars_version
+                        # Strategies run their indicator kernels on these raw arrays
+                        ctx['ohlc_1m_hlc'] = bars_1m.hlc()
+                        if uses_frames:
+                            # The buffers cache their frames, so this only builds a DataFrame once per change
+                            ctx['1m'] = bars_1m.frame()
+                            ctx['15s'] = bars_15s.frame()
+                    ctx['current_equity'] = trader.equity
+                    ctx['current_price_tick'] = current_tick_price
+                    # decide() may block (SafeStrategy's AI overseer makes an HTTP request), so keep it off the shared loop
+                    decision = await run_in_executor(None, decide, symbol, ctx, trader)
+                    if type(decision) is not Decision:
+                        decision = as_decision(decision) # Legacy dict-returning strategy
+                    action, sl_offset, tp_offset, comment = decision
+
+                    if action:
+                        trade_action = ACTION_NAMES[action]
+                        after(0, log, f"Strategy signal: {trade_action.upper()} for {symbol}.")
+                        after(0, execute_trade, trade_action, symbol, sl_offset, tp_offset, comment)
+
+                try:
+                    await wait_for(wait_tick(), _SCALP_IDLE_TIMEOUT_S)
+                except asyncio.TimeoutError:
+                    pass
+                clear_tick()
+        finally:
+            trader.unregister_tick_callback(on_tick)
+
+    def _execute_trade(self, side: str, symbol: str, sl_offset_strategy: float | None, tp_offset_strategy: float | None, strategy_comment: str, *, size: float, default_tp: float, default_sl: float):
+        """
+        Queues a market order for a strategy signal. start_scalping binds size and the GUI
+        TP/SL defaults with functools.partial. A missing or zero strategy offset falls back to
+        the GUI default; a zero offset would have placed no stop/target at all.
+        """
+        if not self.is_scalping:
+            return # Signal scheduled before Stop was pressed
+        final_tp_pips = tp_offset_strategy or default_tp
+        final_sl_pips = sl_offset_strategy or default_sl
 
         self._log(f"Attempting to place market order: {side.upper()} {size} lots of {symbol}")
-        success, message = self.trader.place_market_order(symbol_name=symbol, volume_lots=size, side=side, take_profit_pips=final_tp_pips, stop_loss_pips=final_sl_pips)
+        # Signals arriving within a short window go out together
+        self._pending_orders.append(OrderReq(symbol, size, ORDER_SIDE_BUY if side == "buy" else ORDER_SIDE_SELL, final_tp_pips, final_sl_pips, strategy_comment))
+        if len(self._pending_orders) >= _ORDER_BATCH_MAX:
+            self._flush_orders()
+        elif self._flush_timer is None:
+            self._flush_timer = self.after(_ORDER_BATCH_WINDOW_MS, self._flush_orders)
+
+    def _discard_pending_orders(self):
+        if self._flush_timer is not None:
+            self.after_cancel(self._flush_timer)
+            self._flush_timer = None
+        self._pending_orders.clear()
+
+    def _flush_orders(self):
+        if self._flush_timer is not None:
+            self.after_cancel(self._flush_timer)
+            self._flush_timer = None
+        orders, self._pending_orders = self._pending_orders, []
+        if not orders or not self.is_scalping:
+            return
+
+        for success, message in self.trader.place_market_orders_batch(orders):
+            if success:
+                self._log(f"Order request successful: {message}")
+                self.total_trades += 1
+                self.current_batch_trades += 1
+            else:
+                self._log(f"Order request failed: {message}")
+        self.trades_var.set(str(self.total_trades))
 
-        if success:
-            self._log(f"Order request successful: {message}")
-            self.total_trades += 1
-            self.trades_var.set(str(self.total_trades))
-            self.current_batch_trades += 1
-        else:
-            self._log(f"Order request failed: {message}")
- 
     def _log(self, msg: str):
         ts = time.strftime("%H:%M:%S")
+        self._log_buf.append(f"[{ts}] {msg}\n")
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.after(_LOG_FLUSH_MS, self._flush_log)
+
+    def _flush_log(self):
+        # One insert and one scroll per batch of lines instead of per line
+        self._log_flush_scheduled = False
+        if not self._log_buf:
+            return
+        text = "".join(self._log_buf)
+        self._log_buf.clear()
         self.output.configure(state="normal")
-        self.output.insert("end", f"[{ts}] {msg}\n")
+        self.output.insert("end", text)
+        # Keep the widget bounded so long sessions don't grow memory and rewrap cost forever
+        # Trimming only once the slack is used up keeps the B-tree delete off most flushes
+        lines = int(self.output.index("end-1c").split(".")[0])
+        if lines > _MAX_LOG_LINES + _LOG_TRIM_SLACK:
+            self.output.delete("1.0", f"{lines - _MAX_LOG_LINES}.0")
         self.output.see("end")
         self.output.configure(state="disabled")
 
@@ -0,0 +1,72 @@
+"""Persistent on-disk cache for warm-up OHLC history.
+
+Bars are stored in a small SQLite database keyed by "symbol:timeframe:YYYY-MM", so a restart
+can seed the Trader's OHLC buffers without asking the broker for the same history again.
+Empty results are cached briefly as well, so a symbol without data isn't re-requested on
+every selection.
+"""
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+DEFAULT_CACHE_PATH = ".ohlc_cache.sqlite3"
+HISTORY_TTL_S = 86400 # Cached bars are dropped after a day
+NEGATIVE_TTL_S = 300 # "No data" answers are trusted for five minutes
+
+# (timestamps in UTC nanoseconds, rows of (open, high, low, close, volume)), oldest first
+CachedBars = Tuple[List[int], List[Tuple[float, float, float, float, float]]]
+
+
+class OHLCHistoryCache:
+    """SQLite-backed store of OHLC bars per symbol, timeframe and month. Safe to share across threads."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ohlc_history ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(symbol: str, timeframe: str, when: Optional[datetime] = None) -> str:
+        when = when or datetime.now(timezone.utc)
+        return f"{symbol}:{timeframe}:{when:%Y-%m}"
+
+    def get(self, symbol: str, timeframe: str) -> Optional[CachedBars]:
+        """
+        Returns the cached bars for this month, ([], []) for a cached "no data" answer,
+        or None if nothing usable is stored.
+        """
+        key = self.make_key(symbol, timeframe)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, payload FROM ohlc_history WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        payload = json.loads(row[1])
+        return payload["t"], [tuple(r) for r in payload["r"]]
+
+    def put(self, symbol: str, timeframe: str, timestamps: List[int], rows: List[Tuple[float, ...]], ttl: float = HISTORY_TTL_S) -> None:
+        """Stores bars (oldest first) under this month's key, replacing any previous entry."""
+        key = self.make_key(symbol, timeframe)
+        payload = json.dumps({"t": [int(ts) for ts in timestamps], "r": [list(map(float, r)) for r in rows]})
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ohlc_history (key, expires_at, payload) VALUES (?, ?, ?)",
+                (key, time.time() + ttl, payload)
+            )
+
+    def put_empty(self, symbol: str, timeframe: str) -> None:
+        """Remembers that the broker returned no bars, so the request isn't repeated right away."""
+        self.put(symbol, timeframe, [], [], ttl=NEGATIVE_TTL_S)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
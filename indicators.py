@@ -1,6 +1,15 @@
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
 
+# Numba is optional: when installed, the tail-value indicators run as compiled single-pass
+# loops that release the GIL; otherwise they fall back to vectorised NumPy.
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
 # Ensure DataFrame has the required OHLC columns, optionally Volume
 # For pandas_ta, columns are often expected to be lowercase: 'open', 'high', 'low', 'close', 'volume'
 
@@ -177,6 +186,105 @@ def calculate_adx(ohlc_df: pd.DataFrame, length: int = 14) -> pd.DataFrame:
     return adx_df
 
 
+# --- Tail-value variants ---
+# The functions below take plain NumPy arrays (e.g. df['close'].to_numpy()) and return only the
+# most recent indicator value as a float, without building a full pandas Series. They follow the
+# same recurrences as the pandas-ta defaults used above and return NaN when there is not enough data.
+
+def _ewm_adjusted_last(values: np.ndarray, alpha: float) -> float:
+    """Last value of pandas' ewm(alpha=alpha, adjust=True).mean() over `values`."""
+    weights = (1.0 - alpha) ** np.arange(len(values) - 1, -1, -1, dtype='float64')
+    return float(weights @ values / weights.sum())
+
+def _ema_last_np(close: np.ndarray, length: int) -> float:
+    alpha = 2.0 / (length + 1)
+    seed = close[:length].mean()
+    tail = close[length:]
+    decay = (1.0 - alpha) ** np.arange(len(tail) - 1, -1, -1, dtype='float64')
+    return float((1.0 - alpha) ** len(tail) * seed + alpha * (decay @ tail))
+
+def _rsi_last_np(close: np.ndarray, length: int) -> float:
+    diff = np.diff(close)
+    alpha = 1.0 / length
+    avg_gain = _ewm_adjusted_last(np.clip(diff, 0.0, None), alpha)
+    avg_loss = _ewm_adjusted_last(np.clip(-diff, 0.0, None), alpha)
+    if avg_gain + avg_loss == 0.0:
+        return float('nan')
+    return 100.0 * avg_gain / (avg_gain + avg_loss)
+
+def _atr_last_np(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int) -> float:
+    prev_close = close[:-1]
+    true_range = np.maximum.reduce([
+        high[1:] - low[1:],
+        np.abs(high[1:] - prev_close),
+        np.abs(prev_close - low[1:]),
+    ])
+    return _ewm_adjusted_last(true_range, 1.0 / length)
+
+if _HAVE_NUMBA:
+    @njit(cache=True, nogil=True)
+    def _ema_last_jit(close, length):
+        alpha = 2.0 / (length + 1)
+        ema = 0.0
+        for i in range(length):
+            ema += close[i]
+        ema /= length
+        for i in range(length, close.shape[0]):
+            ema += alpha * (close[i] - ema)
+        return ema
+
+    @njit(cache=True, nogil=True)
+    def _rsi_last_jit(close, length):
+        # Adjusted EWM: numerators and the shared denominator decay together
+        decay = 1.0 - 1.0 / length
+        gain = loss = weight = 0.0
+        for i in range(1, close.shape[0]):
+            change = close[i] - close[i - 1]
+            gain = gain * decay + (change if change > 0.0 else 0.0)
+            loss = loss * decay + (-change if change < 0.0 else 0.0)
+            weight = weight * decay + 1.0
+        avg_gain = gain / weight
+        avg_loss = loss / weight
+        if avg_gain + avg_loss == 0.0:
+            return np.nan
+        return 100.0 * avg_gain / (avg_gain + avg_loss)
+
+    @njit(cache=True, nogil=True)
+    def _atr_last_jit(high, low, close, length):
+        decay = 1.0 - 1.0 / length
+        total = weight = 0.0
+        for i in range(1, close.shape[0]):
+            prev_close = close[i - 1]
+            true_range = max(high[i] - low[i], abs(high[i] - prev_close), abs(prev_close - low[i]))
+            total = total * decay + true_range
+            weight = weight * decay + 1.0
+        return total / weight
+
+def calculate_ema_last(close: np.ndarray, length: int = 20) -> float:
+    """Last EMA value (SMA-seeded, like pandas-ta's default)."""
+    if len(close) < length:
+        return float('nan')
+    if _HAVE_NUMBA:
+        return float(_ema_last_jit(close, length))
+    return _ema_last_np(close, length)
+
+def calculate_rsi_last(close: np.ndarray, length: int = 14) -> float:
+    """Last RSI value using pandas-ta's RMA smoothing of gains and losses."""
+    if len(close) <= length:
+        return float('nan')
+    if _HAVE_NUMBA:
+        return float(_rsi_last_jit(close, length))
+    return _rsi_last_np(close, length)
+
+def calculate_atr_last(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int = 14) -> float:
+    """Last ATR value using pandas-ta's RMA smoothing of the true range."""
+    if len(close) <= length:
+        return float('nan')
+    if _HAVE_NUMBA:
+        return float(_atr_last_jit(high, low, close, length))
+    return _atr_last_np(high, low, close, length)
+
+
 if __name__ == '__main__':
     # Example Usage (requires a sample CSV or DataFrame)
     # Create a sample DataFrame for testing
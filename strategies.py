@@ -1,27 +1,66 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, TYPE_CHECKING, Union
+from typing import Any, Dict, NamedTuple, Optional, TYPE_CHECKING, Union
 import pandas as pd
 from datetime import time, datetime
 from zoneinfo import ZoneInfo  # Python 3.9+
 
-from indicators import calculate_ema, calculate_atr, calculate_rsi, calculate_adx
+from indicators import (
+    calculate_adx, calculate_ema_last, calculate_rsi_last, calculate_atr_last
+)
 
 if TYPE_CHECKING:
     from trading import Trader
 
+# Decision action codes; ACTION_NAMES maps them back to the order side strings
+ACTION_HOLD, ACTION_BUY, ACTION_SELL = 0, 1, 2
+ACTION_NAMES = ("hold", "buy", "sell")
+
+
+class Decision(NamedTuple):
+    """Fixed-layout result of Strategy.decide; a falsy action (ACTION_HOLD) means do nothing."""
+    action: int
+    sl_offset: Optional[float] = None
+    tp_offset: Optional[float] = None
+    comment: str = ""
+
+
+def as_decision(result: Any) -> Decision:
+    """Normalises a decide() result, accepting the legacy {'action': 'buy', ...} dict form."""
+    if isinstance(result, Decision):
+        return result
+    if isinstance(result, dict):
+        action = result.get('action')
+        code = ACTION_NAMES.index(action) if action in ACTION_NAMES else ACTION_HOLD
+        return Decision(code, result.get('sl_offset'), result.get('tp_offset'), result.get('comment', ''))
+    return Decision(ACTION_HOLD)
+
+# Shared fallback for lookups; a default argument would build a new empty Series on every call
+_EMPTY_SERIES = pd.Series(dtype=float)
+
+
+def _hlc_arrays(data: Dict[str, Any], df: pd.DataFrame):
+    """
+    Returns contiguous float64 high, low and close arrays for the *_last indicator kernels:
+    the scalp loop's 'ohlc_1m_hlc' arrays when present, otherwise a copy out of df.
+    """
+    hlc = data.get('ohlc_1m_hlc')
+    if hlc is not None:
+        return hlc
+    return df[['high', 'low', 'close']].to_numpy(dtype='float64').T.copy()
+
 
 class Strategy(ABC):
     """Abstract base class for trading strategies."""
     NAME: str = "Base Strategy"
+    # When False, decide() only depends on completed bars and is skipped until a new bar arrives.
+    # Strategies that read the live tick price should set this to True.
+    tick_sensitive: bool = False
+    # When False, the scalp loop skips building the '1m'/'15s' DataFrames for this strategy
+    uses_frames: bool = True
 
     @abstractmethod
-    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Dict[str, Any]:
-        return {
-            'action': 'hold',
-            'comment': f'{self.NAME} not implemented',
-            'sl_offset': None,
-            'tp_offset': None
-        }
+    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Decision:
+        return Decision(ACTION_HOLD, comment=f'{self.NAME} not implemented')
 
     @abstractmethod
     def get_required_bars(self) -> Dict[str, int]:
@@ -39,6 +78,7 @@ class SafeStrategy(Strategy):
       - Trailing stop activation
     """
     NAME = "Safe (Low-Risk) Trend-Following Scalper"
+    uses_frames = False # Reads 'ohlc_1m' and its arrays, not the loop's frames
 
     def __init__(
         self,
@@ -156,15 +196,10 @@ class SafeStrategy(Strategy):
             # e.g., 22:00–06:00
             return (t >= self.session_start) or (t <= self.session_end)
 
-    def _hold(self, reason: str) -> Dict[str, Any]:
-        return {
-            'action': 'hold',
-            'comment': f"{self.NAME}: {reason}",
-            'sl_offset': None,
-            'tp_offset': None
-        }
+    def _hold(self, reason: str) -> Decision:
+        return Decision(ACTION_HOLD, comment=f"{self.NAME}: {reason}")
 
-    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Dict[str, Any]:
+    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Decision:
         df: pd.DataFrame = data.get('ohlc_1m')
         print("DECIDE() called - OHLC shape:", df.shape if df is not None else "None")
         if df is None or len(df) < self.settings.general.min_bars_for_trading:
@@ -182,19 +217,19 @@ class SafeStrategy(Strategy):
         if not self.in_session(now_raw):
             return self._hold("outside trading session")
 
-        close = df['close']
-        vol = df.get('volume', pd.Series(dtype=float))
+        high, low, close = _hlc_arrays(data, df)
+        vol = df.get('volume', _EMPTY_SERIES)
 
         # --- Indicator Calculation (calculate once) ---
-        price = close.iloc[-1]
-        ema = calculate_ema(df, self.ema_period).iloc[-1]
-        atr = calculate_atr(df, self.atr_period).iloc[-1]
+        price = close[-1]
+        ema = calculate_ema_last(close, self.ema_period)
+        atr = calculate_atr_last(high, low, close, self.atr_period)
         avg_vol = None if vol.empty else vol.rolling(self.atr_period).mean().iloc[-1]
 
         # Indicators for AI payload (calculated regardless of AI use to keep logic simple)
-        fast_ema = calculate_ema(df, 9).iloc[-1]
-        slow_ema = calculate_ema(df, 21).iloc[-1]
-        rsi = calculate_rsi(df, 14).iloc[-1]
+        fast_ema = calculate_ema_last(close, 9)
+        slow_ema = calculate_ema_last(close, 21)
+        rsi = calculate_rsi_last(close, 14)
         adx_df = calculate_adx(df, 14)
         adx = adx_df[f'ADX_14'].iloc[-1] if not adx_df.empty else 0
         # --- End of Indicator Calculation ---
@@ -206,10 +241,10 @@ class SafeStrategy(Strategy):
 
         # Determine trade direction
         if price > ema:
-            action = 'buy'
+            action = ACTION_BUY
             comment = f"price {price:.5f} above EMA{self.ema_period} + buffer"
         else:
-            action = 'sell'
+            action = ACTION_SELL
             comment = f"price {price:.5f} below EMA{self.ema_period} - buffer"
 
         # Base stops
@@ -223,24 +258,24 @@ class SafeStrategy(Strategy):
 
         # Trailing stop logic
         if not self.trailing_activated and (
-            (action == 'buy' and price > ema + 2 * buffer) or
-            (action == 'sell' and price < ema - 2 * buffer)
+            (action == ACTION_BUY and price > ema + 2 * buffer) or
+            (action == ACTION_SELL and price < ema - 2 * buffer)
         ):
             self.trailing_activated = True
             comment += "; trailing stop activated"
 
         if self.trailing_activated:
             breakeven_offset = atr * 0.1
-            prev_close = close.iloc[-2]
-            if action == 'buy':
+            prev_close = close[-2]
+            if action == ACTION_BUY:
                 sl = min(sl, price - (prev_close + breakeven_offset))
             else:
                 sl = min(sl, (prev_close - breakeven_offset) - price)
 
         # --- AI Overseer Integration ---
-        if trader.settings.ai.use_ai_overseer and action in ('buy', 'sell'):
+        if trader.settings.ai.use_ai_overseer and action in (ACTION_BUY, ACTION_SELL):
             # 1) Get indicators for the AI payload (already calculated)
-            intent = 'long' if action == 'buy' else 'short'
+            intent = 'long' if action == ACTION_BUY else 'short'
 
             # 2) Construct payload
             features = {
@@ -259,7 +294,7 @@ class SafeStrategy(Strategy):
 
             # 4) Act on AI advice
             if ai_advice:
-                ai_action_map = {'long': 'buy', 'short': 'sell'}
+                ai_action_map = {'long': ACTION_BUY, 'short': ACTION_SELL}
                 if ai_advice.confidence < trader.settings.ai.advisor_min_confidence:
                     return self._hold(
                         f"AI confidence {ai_advice.confidence:.2%} below threshold "
@@ -268,7 +303,7 @@ class SafeStrategy(Strategy):
 
                 if ai_action_map.get(ai_advice.action) != action:
                     return self._hold(
-                        f"AI action '{ai_advice.action}' contradicts strategy '{action}'. "
+                        f"AI action '{ai_advice.action}' contradicts strategy '{ACTION_NAMES[action]}'. "
                         f"AI Reason: {ai_advice.reason}"
                     )
 
@@ -278,17 +313,12 @@ class SafeStrategy(Strategy):
                 # If AI fails to provide advice, revert to holding for safety
                 return self._hold("AI advisor failed to provide a valid response.")
 
-        return {
-            'action': action,
-            'comment': f"{self.NAME}: {comment}",
-            'sl_offset': sl_pips,
-            'tp_offset': tp_pips,
-            'risk_percentage': self.settings.general.risk_percentage
-        }
+        return Decision(action, sl_pips, tp_pips, f"{self.NAME}: {comment}")
 
 
 class ModerateStrategy(Strategy):
     NAME = "Moderate Trend-Following Scalper"
+    uses_frames = False
 
     def __init__(self, settings):
         self.settings = settings
@@ -300,41 +330,33 @@ class ModerateStrategy(Strategy):
     def get_required_bars(self) -> Dict[str, int]:
         return {'1m': self.settings.general.min_bars_for_trading}
 
-    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Dict[str, Any]:
+    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Decision:
         df: pd.DataFrame = data.get('ohlc_1m')
         if df is None or len(df) < self.settings.general.min_bars_for_trading:
-            return {
-                'action': 'hold',
-                'comment': f'{self.NAME}: insufficient data',
-                'sl_offset': None,
-                'tp_offset': None
-            }
+            return Decision(ACTION_HOLD, comment=f'{self.NAME}: insufficient data')
 
-        ema = calculate_ema(df['close'], self.ema_period).iloc[-1]
-        atr = calculate_atr(df, self.atr_period).iloc[-1]
-        price = df['close'].iloc[-1]
+        high, low, close = _hlc_arrays(data, df)
+        ema = calculate_ema_last(close, self.ema_period)
+        atr = calculate_atr_last(high, low, close, self.atr_period)
+        price = close[-1]
 
         if price > ema:
-            action = 'buy'
+            action = ACTION_BUY
             comment = f'{self.NAME}: bullish trend detected'
         elif price < ema:
-            action = 'sell'
+            action = ACTION_SELL
             comment = f'{self.NAME}: bearish trend detected'
         else:
-            return {
-                'action': 'hold',
-                'comment': f'{self.NAME}: no clear trend',
-                'sl_offset': None,
-                'tp_offset': None
-            }
+            return Decision(ACTION_HOLD, comment=f'{self.NAME}: no clear trend')
 
         sl_offset = atr * self.stop_multiplier
         tp_offset = atr * self.target_multiplier
-        return {'action': action, 'comment': comment, 'sl_offset': sl_offset, 'tp_offset': tp_offset}
+        return Decision(action, sl_offset, tp_offset, comment)
 
 
 class AggressiveStrategy(Strategy):
     NAME = "Aggressive Trend-Following Scalper"
+    uses_frames = False
 
     def __init__(self, settings):
         self.settings = settings
@@ -346,41 +368,33 @@ class AggressiveStrategy(Strategy):
     def get_required_bars(self) -> Dict[str, int]:
         return {'1m': self.settings.general.min_bars_for_trading}
 
-    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Dict[str, Any]:
+    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Decision:
         df: pd.DataFrame = data.get('ohlc_1m')
         if df is None or len(df) < self.settings.general.min_bars_for_trading:
-            return {
-                'action': 'hold',
-                'comment': f'{self.NAME}: insufficient data',
-                'sl_offset': None,
-                'tp_offset': None
-            }
+            return Decision(ACTION_HOLD, comment=f'{self.NAME}: insufficient data')
 
-        ema = calculate_ema(df['close'], self.ema_period).iloc[-1]
-        atr = calculate_atr(df, self.atr_period).iloc[-1]
-        price = df['close'].iloc[-1]
+        high, low, close = _hlc_arrays(data, df)
+        ema = calculate_ema_last(close, self.ema_period)
+        atr = calculate_atr_last(high, low, close, self.atr_period)
+        price = close[-1]
 
         if price > ema:
-            action = 'buy'
+            action = ACTION_BUY
             comment = f'{self.NAME}: going long aggressively'
         elif price < ema:
-            action = 'sell'
+            action = ACTION_SELL
             comment = f'{self.NAME}: going short aggressively'
         else:
-            return {
-                'action': 'hold',
-                'comment': f'{self.NAME}: awaiting breakout',
-                'sl_offset': None,
-                'tp_offset': None
-            }
+            return Decision(ACTION_HOLD, comment=f'{self.NAME}: awaiting breakout')
 
         sl_offset = atr * self.stop_multiplier
         tp_offset = atr * self.target_multiplier
-        return {'action': action, 'comment': comment, 'sl_offset': sl_offset, 'tp_offset': tp_offset}
+        return Decision(action, sl_offset, tp_offset, comment)
 
 
 class MomentumStrategy(Strategy):
     NAME = "Momentum Fade Scalper"
+    uses_frames = False
 
     def __init__(self, settings):
         self.settings = settings
@@ -393,42 +407,34 @@ class MomentumStrategy(Strategy):
     def get_required_bars(self) -> Dict[str, int]:
         return {'1m': self.settings.general.min_bars_for_trading}
 
-    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Dict[str, Any]:
+    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Decision:
         df: pd.DataFrame = data.get('ohlc_1m')
         if df is None or len(df) < self.settings.general.min_bars_for_trading:
-            return {
-                'action': 'hold',
-                'comment': f'{self.NAME}: insufficient data',
-                'sl_offset': None,
-                'tp_offset': None
-            }
+            return Decision(ACTION_HOLD, comment=f'{self.NAME}: insufficient data')
 
-        ema = calculate_ema(df['close'], self.ema_period).iloc[-1]
-        atr = calculate_atr(df, self.atr_period).iloc[-1]
-        price = df['close'].iloc[-1]
+        high, low, close = _hlc_arrays(data, df)
+        ema = calculate_ema_last(close, self.ema_period)
+        atr = calculate_atr_last(high, low, close, self.atr_period)
+        price = close[-1]
         diff = price - ema
 
         if diff > atr * self.fade_threshold:
-            action = 'sell'
+            action = ACTION_SELL
             comment = f'{self.NAME}: fading overextension'
         elif diff < -atr * self.fade_threshold:
-            action = 'buy'
+            action = ACTION_BUY
             comment = f'{self.NAME}: fading downside spike'
         else:
-            return {
-                'action': 'hold',
-                'comment': f'{self.NAME}: no fade opportunity',
-                'sl_offset': None,
-                'tp_offset': None
-            }
+            return Decision(ACTION_HOLD, comment=f'{self.NAME}: no fade opportunity')
 
         sl_offset = atr * self.stop_multiplier
         tp_offset = atr * self.target_multiplier
-        return {'action': action, 'comment': comment, 'sl_offset': sl_offset, 'tp_offset': tp_offset}
+        return Decision(action, sl_offset, tp_offset, comment)
 
 
 class MeanReversionStrategy(Strategy):
     NAME = "Mean-Reversion Scalper"
+    uses_frames = False
 
     def __init__(self, settings):
         self.settings = settings
@@ -441,36 +447,27 @@ class MeanReversionStrategy(Strategy):
     def get_required_bars(self) -> Dict[str, int]:
         return {'1m': self.settings.general.min_bars_for_trading}
 
-    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Dict[str, Any]:
+    def decide(self, symbol: str, data: Dict[str, Any], trader: "Trader") -> Decision:
         df: pd.DataFrame = data.get('ohlc_1m')
         if df is None or len(df) < self.settings.general.min_bars_for_trading:
-            return {
-                'action': 'hold',
-                'comment': f'{self.NAME}: insufficient data',
-                'sl_offset': None,
-                'tp_offset': None
-            }
+            return Decision(ACTION_HOLD, comment=f'{self.NAME}: insufficient data')
 
-        ema = calculate_ema(df['close'], self.ema_period).iloc[-1]
-        atr = calculate_atr(df, self.atr_period).iloc[-1]
-        price = df['close'].iloc[-1]
+        high, low, close = _hlc_arrays(data, df)
+        ema = calculate_ema_last(close, self.ema_period)
+        atr = calculate_atr_last(high, low, close, self.atr_period)
+        price = close[-1]
         upper = ema + atr * self.band_multiplier
         lower = ema - atr * self.band_multiplier
 
         if price > upper:
-            action = 'sell'
+            action = ACTION_SELL
             comment = f'{self.NAME}: price above upper band'
         elif price < lower:
-            action = 'buy'
+            action = ACTION_BUY
             comment = f'{self.NAME}: price below lower band'
         else:
-            return {
-                'action': 'hold',
-                'comment': f'{self.NAME}: within bands',
-                'sl_offset': None,
-                'tp_offset': None
-            }
+            return Decision(ACTION_HOLD, comment=f'{self.NAME}: within bands')
 
         sl_offset = atr * self.stop_multiplier
         tp_offset = atr * self.target_multiplier
-        return {'action': action, 'comment': comment, 'sl_offset': sl_offset, 'tp_offset': tp_offset}
+        return Decision(action, sl_offset, tp_offset, comment)
@@ -9,12 +9,18 @@ from ctrader_open_api.messages.OpenApiModelMessages_pb2 import ProtoOATrendbarPe
 from typing import List, Any, Optional, Tuple, Dict
 import urllib.parse
 from http.server import BaseHTTPRequestHandler, HTTPServer
+import platform
 import queue
+import socket
+from collections import deque
+import sqlite3
 import sys
 import traceback
+import numpy as np
 import pandas as pd
 from datetime import datetime, timezone
 from dataclasses import dataclass
+from history_cache import OHLCHistoryCache
 
 @dataclass
 class Position:
@@ -36,6 +42,107 @@ class AiAdvice:
     tp_pips: Optional[float] = None
     reason: Optional[str] = None
 
+class OHLCRingBuffer:
+    """
+    Fixed-capacity OHLCV history for one symbol and timeframe.
+
+    Bars are written into a preallocated (capacity, 5) float64 array, so appending is O(1)
+    instead of reallocating a DataFrame per bar. Readers get contiguous arrays via latest()/hlc(),
+    or a DataFrame view via frame() that is built at most once per change.
+    """
+    COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        # One spare slot: the row being overwritten is never inside the window a reader on
+        # another thread computed from the previous head.
+        self._slots = capacity + 1
+        self._data = np.empty((self._slots, 5), dtype=np.float64)
+        self._times = np.empty(self._slots, dtype=np.int64) # UTC nanoseconds
+        self._head = 0 # Total bars ever written
+        self.version = 0 # Bumped on every change; cheap "has anything changed" check for readers
+        self._frame: Optional[pd.DataFrame] = None
+        self._frame_version = -1
+
+    def __len__(self) -> int:
+        return min(self._head, self.capacity)
+
+    @property
+    def empty(self) -> bool:
+        return self._head == 0
+
+    def append(self, timestamp: datetime, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        slot = self._head % self._slots
+        self._data[slot] = (open_, high, low, close, volume)
+        self._times[slot] = pd.Timestamp(timestamp).value
+        self._head += 1
+        self.version += 1
+
+    def load(self, timestamps: List[datetime], rows: List[Tuple[float, float, float, float, float]]) -> None:
+        """Replaces the contents with the given bars (oldest first), keeping the newest `capacity`."""
+        rows = rows[-self.capacity:]
+        timestamps = timestamps[-self.capacity:]
+        n = len(rows)
+        if n:
+            self._data[:n] = rows
+            self._times[:n] = [pd.Timestamp(ts).value for ts in timestamps]
+        self._head = n
+        self.version += 1
+
+    def merge(self, timestamps: List[datetime], rows: List[Tuple[float, float, float, float, float]]) -> None:
+        """Merges bars (oldest first) into the history by timestamp; where both have a bar, the new one wins."""
+        old_times, old_rows = self.snapshot()
+        bars = dict(zip(old_times, old_rows))
+        bars.update(zip((pd.Timestamp(ts).value for ts in timestamps), rows))
+        times = sorted(bars)
+        self.load(times, [bars[t] for t in times])
+
+    def _indices(self, n: Optional[int]) -> np.ndarray:
+        head = self._head
+        count = min(head, self.capacity) if n is None else min(n, head, self.capacity)
+        return np.arange(head - count, head) % self._slots
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """Returns the newest n bars (all if None) as a contiguous (n, 5) OHLCV array, oldest first."""
+        return self._data[self._indices(n)]
+
+    def hlc(self, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns contiguous float64 high, low and close arrays of the newest n bars."""
+        idx = self._indices(n)
+        data = self._data
+        return data[idx, 1], data[idx, 2], data[idx, 3]
+
+    def snapshot(self) -> Tuple[List[int], List[Tuple[float, float, float, float, float]]]:
+        """Returns (timestamps in UTC nanoseconds, OHLCV rows) as plain lists, oldest first."""
+        idx = self._indices(None)
+        return self._times[idx].tolist(), [tuple(row) for row in self._data[idx].tolist()]
+
+    def frame(self) -> pd.DataFrame:
+        """Returns the history as a DataFrame indexed by timestamp; cached until the next change."""
+        if self._frame_version != self.version:
+            version = self.version
+            idx = self._indices(None)
+            index = pd.DatetimeIndex(pd.to_datetime(self._times[idx], utc=True), name='timestamp')
+            self._frame = pd.DataFrame(self._data[idx], index=index, columns=list(self.COLUMNS))
+            self._frame_version = version
+        return self._frame
+
+# Order sides as ints; the values match ProtoOATradeSide so they can be written to requests as-is
+ORDER_SIDE_BUY = 1
+ORDER_SIDE_SELL = 2
+_MAX_ORDER_COMMENT_LEN = 512 # ProtoOANewOrderReq.comment limit
+
+@dataclass(slots=True)
+class OrderReq:
+    """A market order ready for submission; built once per signal and passed straight through."""
+    symbol: str
+    volume: float # Lots
+    side: int # ORDER_SIDE_BUY or ORDER_SIDE_SELL
+    tp_pips: Optional[float] = None
+    sl_pips: Optional[float] = None
+    comment: str = ""
+    client_msg_id: Optional[str] = None
+
 TREND_BAR_PERIOD_SECONDS = {
     ProtoOATrendbarPeriod.M1: 60,
     ProtoOATrendbarPeriod.M5: 300,
@@ -145,10 +252,19 @@ except ImportError as e:
 
 TOKEN_FILE_PATH = "tokens.json"
 
+# Busy-poll budget (microseconds) for the feed socket; Linux only, and needs CAP_NET_ADMIN
+# when it exceeds the net.core.busy_read sysctl.
+_SOCKET_BUSY_POLL_US = 50
+# The socket module doesn't export SO_BUSY_POLL; 46 is its value only on the asm-generic ABIs listed here
+_ASM_GENERIC_MACHINES = {"x86_64", "i386", "i686", "aarch64", "armv7l", "armv6l", "riscv64", "s390x"}
+_SO_BUSY_POLL = getattr(socket, "SO_BUSY_POLL", None)
+if _SO_BUSY_POLL is None and sys.platform.startswith("linux") and platform.machine() in _ASM_GENERIC_MACHINES:
+    _SO_BUSY_POLL = 46
+
 from typing import Callable
 
 class Trader:
-    def __init__(self, settings, history_size: int = 100, on_account_update: Optional[Callable[[Dict[str, Any]], None]] = None, on_positions_update: Optional[Callable[[Dict[int, Position]], None]] = None):
+    def __init__(self, settings, history_size: int = 100, on_account_update: Optional[Callable[[Dict[str, Any]], None]] = None, on_positions_update: Optional[Callable[[Dict[int, Position]], None]] = None, on_bars_updated: Optional[Callable[[str], None]] = None):
         """
         Initializes the Trader.
 
@@ -157,10 +273,14 @@ class Trader:
             history_size: The maximum size of the price history to maintain.
             on_account_update: An optional callback function to be invoked with account summary updates.
             on_positions_update: An optional callback function to be invoked with position updates.
+            on_bars_updated: An optional callback function invoked with the symbol name whenever
+                its OHLC history changes (a bar completes or history is loaded).
         """
         self.settings = settings
         self.on_account_update = on_account_update
         self.on_positions_update = on_positions_update
+        self.on_bars_updated = on_bars_updated
+        self._tick_callbacks: List[Callable[[str, float], None]] = []
         self.is_connected: bool = False
         self._is_client_connected: bool = False
         self._last_error: str = ""
@@ -175,8 +295,13 @@ class Trader:
             '5m': 300
         }
         self.current_bars: Dict[str, Dict[str, Dict]] = {} # symbol -> timeframe -> bar
-        self.ohlc_history: Dict[str, Dict[str, pd.DataFrame]] = {} # symbol -> timeframe -> df
+        self.ohlc_history: Dict[str, Dict[str, OHLCRingBuffer]] = {} # symbol -> timeframe -> bars
         self.max_ohlc_history_len = 500 # Max number of OHLC bars to keep per timeframe
+        try:
+            self._history_cache: Optional[OHLCHistoryCache] = OHLCHistoryCache()
+        except sqlite3.Error as e:
+            print(f"OHLC history cache unavailable ({e}); history will always be fetched.")
+            self._history_cache = None
 
 
         # Initialize token fields before loading
@@ -192,6 +317,8 @@ class Trader:
         self.equity: Optional[float] = None
         self.currency: Optional[str] = None
         self.used_margin: Optional[float] = None # For margin used
+        self._account_ready = threading.Event() # Set once account_id and balance are known, or setup has failed
+        self._account_failed = False # True when _account_ready was set because setup failed
 
         # Position data
         self.open_positions: Dict[int, Position] = {}
@@ -279,6 +406,9 @@ class Trader:
         print("OpenAPI Client Connected.")
         self._is_client_connected = True
         self._last_error = ""
+        client.whenConnected().addCallback(self._tune_feed_socket).addErrback(
+            lambda failure: print(f"Could not tune feed socket: {failure.getErrorMessage()}")
+        )
         req = ProtoOAApplicationAuthReq()
         req.clientId = self.settings.openapi.client_id or ""
         req.clientSecret = self.settings.openapi.client_secret or ""
@@ -290,11 +420,36 @@ class Trader:
         d = client.send(req)
         d.addCallbacks(self._handle_app_auth_response, self._handle_send_error)
 
+    def _tune_feed_socket(self, protocol: Any) -> None:
+        """Disables Nagle and enables busy polling on the TCP socket under the TLS transport."""
+        sock = None
+        transport = getattr(protocol, "transport", None)
+        while transport is not None:
+            handle = transport.getHandle() if hasattr(transport, "getHandle") else None
+            if isinstance(handle, socket.socket):
+                sock = handle
+                break
+            transport = getattr(transport, "transport", None)
+        if sock is None:
+            print("Feed socket not reachable; leaving socket options unchanged.")
+            return
+
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            print(f"Could not set TCP_NODELAY on feed socket: {e}")
+        if _SO_BUSY_POLL is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, _SO_BUSY_POLL, _SOCKET_BUSY_POLL_US)
+            except OSError as e:
+                print(f"Could not set SO_BUSY_POLL on feed socket: {e}")
+
     def _on_client_disconnected(self, client: Client, reason: Any) -> None:
         print(f"OpenAPI Client Disconnected: {reason}")
         self.is_connected = False
         self._is_client_connected = False
         self._account_auth_initiated = False # Reset flag
+        self._fail_account_wait()
 
     def _on_message_received(self, client: Client, message: Any) -> None:
         print(f"Original message received (type: {type(message)}): {message}")
@@ -375,12 +530,16 @@ class Trader:
             if "NOT_AUTHENTICATED" in actual_message.errorCode:
                 self._last_error += ". Please reconnect."
                 self.disconnect()
+            if not self._account_ready.is_set():
+                self._fail_account_wait() # An error before the account is ready means setup failed
         elif isinstance(actual_message, ProtoErrorRes): # Common error
             print(f"  Dispatching to ProtoErrorRes (common) handler. Error code: {actual_message.errorCode}, Description: {actual_message.description}")
             self._last_error = f"Common Error {actual_message.errorCode}: {actual_message.description}"
             if "NOT_AUTHENTICATED" in actual_message.errorCode:
                 self._last_error += ". Please reconnect."
                 self.disconnect()
+            if not self._account_ready.is_set():
+                self._fail_account_wait()
         # Check if it's still the ProtoMessage wrapper (meaning Protobuf.extract didn't deserialize it further)
         elif isinstance(actual_message, ProtoMessage): # Covers actual_message is message (if message was ProtoMessage)
                                                        # and actual_message is the result of extract but still a wrapper.
@@ -667,14 +826,24 @@ class Trader:
             self._last_error = "ctidTraderAccountId not available for operations."
             return
 
-        # Fetch historical data if we don't have it
-        if symbol_name not in self.ohlc_history or self.ohlc_history.get(symbol_name, {}).get('1m', pd.DataFrame()).empty:
-            print(f"Fetching initial historical 1m trendbars for {symbol_name} (ID: {symbol_id}).")
-            self._send_get_trendbars_request(
-                symbol_id=symbol_id,
-                period=ProtoOATrendbarPeriod.M1,
-                count=self.max_ohlc_history_len
-            )
+        # Fetch historical data if we don't have it, or only the bars missing since the copy cached on disk
+        if symbol_name not in self.ohlc_history or self.ohlc_history[symbol_name]['1m'].empty:
+            covered_until = self._load_cached_history(symbol_name, '1m')
+            if covered_until is None:
+                print(f"Fetching initial historical 1m trendbars for {symbol_name} (ID: {symbol_id}).")
+                self._send_get_trendbars_request(
+                    symbol_id=symbol_id,
+                    period=ProtoOATrendbarPeriod.M1,
+                    count=self.max_ohlc_history_len
+                )
+            elif time.time() - covered_until >= self.timeframes_seconds['1m']:
+                print(f"Fetching 1m trendbars for {symbol_name} (ID: {symbol_id}) missing since the cached history.")
+                self._send_get_trendbars_request(
+                    symbol_id=symbol_id,
+                    period=ProtoOATrendbarPeriod.M1,
+                    count=self.max_ohlc_history_len,
+                    from_timestamp=int(covered_until * 1000)
+                )
 
         # Subscribe to live spots if not already subscribed
         if symbol_id not in self.subscribed_spot_symbol_ids:
@@ -682,6 +851,58 @@ class Trader:
             self._send_subscribe_spots_request(self.ctid_trader_account_id, [symbol_id])
             self.subscribed_spot_symbol_ids.add(symbol_id)
 
+    def _load_cached_history(self, symbol_name: str, tf_str: str) -> Optional[float]:
+        """
+        Seeds the symbol's OHLC buffer from the on-disk cache.
+        Returns the time (epoch seconds) up to which history is covered, so only later bars
+        need to be requested, or None if nothing usable is cached. A recent "no data" answer
+        from the broker counts as covered up to now.
+        """
+        if self._history_cache is None:
+            return None
+        try:
+            cached = self._history_cache.get(symbol_name, tf_str)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read cached {tf_str} history for {symbol_name}: {e}")
+            return None
+        if cached is None:
+            return None
+
+        timestamps, rows = cached
+        if not rows:
+            print(f"Skipping {tf_str} history fetch for {symbol_name}: broker recently returned no bars.")
+            return time.time()
+
+        self._initialize_data_for_symbol(symbol_name)
+        self.ohlc_history[symbol_name][tf_str].load(timestamps, rows)
+        print(f"Loaded {len(rows)} cached {tf_str} bars for {symbol_name}.")
+        if self.on_bars_updated:
+            self.on_bars_updated(symbol_name)
+        return timestamps[-1] / 1e9 + self.timeframes_seconds[tf_str]
+
+    def _store_cached_history(self, symbol_name: str, tf_str: str, in_background: bool = False) -> None:
+        """
+        Writes the symbol's current bars (or a "no data" entry) to the on-disk cache.
+        With in_background the snapshot is still taken here, but the write runs on its own thread.
+        """
+        if self._history_cache is None:
+            return
+        bars = self.ohlc_history.get(symbol_name, {}).get(tf_str)
+        snapshot = None if bars is None or bars.empty else bars.snapshot()
+        if in_background:
+            threading.Thread(target=self._write_cached_history, args=(symbol_name, tf_str, snapshot), daemon=True).start()
+        else:
+            self._write_cached_history(symbol_name, tf_str, snapshot)
+
+    def _write_cached_history(self, symbol_name: str, tf_str: str, snapshot) -> None:
+        try:
+            if snapshot is None:
+                self._history_cache.put_empty(symbol_name, tf_str)
+            else:
+                self._history_cache.put(symbol_name, tf_str, *snapshot)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not cache {tf_str} history for {symbol_name}: {e}")
+
     def _handle_account_auth_response(self, response: ProtoOAAccountAuthRes) -> None:
         print(f"Received ProtoOAAccountAuthRes: {response}")
         # The response contains the ctidTraderAccountId that was authenticated.
@@ -727,6 +948,7 @@ class Trader:
         if not selected_account.ctidTraderAccountId:
             print("Error: Account in list has no ctidTraderAccountId.")
             self._last_error = "Account found but missing ID."
+            self._fail_account_wait()
             return
 
         self.ctid_trader_account_id = selected_account.ctidTraderAccountId
@@ -762,6 +984,7 @@ class Trader:
             print(f"Value of trader_object.ctidTraderAccountId before assignment: {current_ctid}, type: {type(current_ctid)}")
             self.account_id = str(current_ctid)
             print(f"self.account_id set to: {self.account_id}")
+            self._update_account_ready()
         elif trader_details_updated:
             print(f"Trader details updated, but ctidTraderAccountId missing from trader_object. trader_object: {trader_object}")
         else:
@@ -826,6 +1049,8 @@ class Trader:
             # else:
             #     print(f"  Used margin not found in ProtoOATrader for {logged_ctid}. self.used_margin remains: {self.used_margin}")
 
+            self._update_account_ready()
+
             # If a callback is registered, invoke it with the latest summary
             if self.on_account_update:
                 summary = self.get_account_summary()
@@ -836,6 +1061,17 @@ class Trader:
             print("_update_trader_details received empty trader_proto.")
         return None
 
+    def _update_account_ready(self):
+        """Signals waiters once both the account ID and balance have been received."""
+        if self.account_id and self.balance is not None:
+            self._account_failed = False
+            self._account_ready.set()
+
+    def _fail_account_wait(self):
+        """Wakes wait_for_account_ready with a failure; _last_error holds the reason."""
+        self._account_failed = True
+        self._account_ready.set()
+
     def _initialize_data_for_symbol(self, symbol_name: str):
         """Initializes the data structures for a new symbol if they don't exist."""
         if symbol_name not in self.price_histories:
@@ -844,10 +1080,7 @@ class Trader:
             self.ohlc_history[symbol_name] = {}
             self.current_bars[symbol_name] = {}
             for tf_str in self.timeframes_seconds.keys():
-                self.ohlc_history[symbol_name][tf_str] = pd.DataFrame(
-                    columns=['open', 'high', 'low', 'close', 'volume']
-                )
-                self.ohlc_history[symbol_name][tf_str].index.name = 'timestamp'
+                self.ohlc_history[symbol_name][tf_str] = OHLCRingBuffer(self.max_ohlc_history_len)
                 self.current_bars[symbol_name][tf_str] = {
                     'timestamp': None, 'open': None, 'high': None, 'low': None, 'close': None, 'volume': 0
                 }
@@ -883,6 +1116,7 @@ class Trader:
         self.price_histories[symbol_name].append(current_price)
 
         # OHLC Aggregation Logic
+        bars_completed = False
         for tf_str, tf_seconds in self.timeframes_seconds.items():
             current_tf_bar = self.current_bars[symbol_name][tf_str]
 
@@ -896,26 +1130,14 @@ class Trader:
                 bar_end_time = current_tf_bar['timestamp'] + pd.Timedelta(seconds=tf_seconds)
                 if event_dt >= bar_end_time:
                     # Finalize the completed bar
-                    completed_bar_df = pd.DataFrame([{
-                        'open': current_tf_bar['open'], 'high': current_tf_bar['high'],
-                        'low': current_tf_bar['low'], 'close': current_tf_bar['close'],
-                        'volume': current_tf_bar['volume']
-                    }], index=[current_tf_bar['timestamp']])
-                    completed_bar_df.index.name = 'timestamp'
-
-                    # Append to history, avoiding concat with empty dataframe
-                    history_df = self.ohlc_history[symbol_name][tf_str]
-                    if history_df.empty:
-                        self.ohlc_history[symbol_name][tf_str] = completed_bar_df
-                    else:
-                        self.ohlc_history[symbol_name][tf_str] = pd.concat([
-                            history_df, completed_bar_df
-                        ])
-
-                    # Trim history
-                    history_df = self.ohlc_history[symbol_name][tf_str]
-                    if len(history_df) > self.max_ohlc_history_len:
-                        self.ohlc_history[symbol_name][tf_str] = history_df.iloc[-self.max_ohlc_history_len:]
+                    bars_completed = True
+                    self.ohlc_history[symbol_name][tf_str].append(
+                        current_tf_bar['timestamp'], current_tf_bar['open'], current_tf_bar['high'],
+                        current_tf_bar['low'], current_tf_bar['close'], current_tf_bar['volume']
+                    )
+                    if tf_str == '1m':
+                        # Keep the disk cache current so a restart only needs the bars missed while down
+                        self._store_cached_history(symbol_name, tf_str, in_background=True)
 
                     # Start a new bar
                     bar_start_time = event_dt.replace(second=(event_dt.second // tf_seconds) * tf_seconds, microsecond=0)
@@ -930,6 +1152,11 @@ class Trader:
                     current_tf_bar['close'] = current_price
                     current_tf_bar['volume'] += 1
 
+        if bars_completed and self.on_bars_updated:
+            self.on_bars_updated(symbol_name)
+
+        for callback in self._tick_callbacks:
+            callback(symbol_name, current_price)
         
     def get_available_symbol_names(self) -> List[str]:
         """Returns a sorted list of symbol name strings available from the API."""
@@ -1172,6 +1399,9 @@ class Trader:
             self._last_error = "OpenAPI library not available (mock mode)."
             return False
 
+        self._account_ready.clear()
+        self._account_failed = False
+
         # 1. Check if loaded token is valid and not expired
         self._last_error = "Checking saved tokens..." # For GUI
         if self._access_token and not self._is_token_expired():
@@ -1353,7 +1583,7 @@ class Trader:
             self._save_tokens_to_file() # Save tokens after successful exchange
             if self._start_openapi_client_service():
                 # Connection to TCP endpoint will now proceed, leading to ProtoOAApplicationAuthReq etc.
-                # The _check_connection in GUI will handle the rest.
+                # The GUI waits on wait_for_account_ready() for the rest.
                 return True
             else:
                 # _start_openapi_client_service would have set _last_error
@@ -1502,16 +1732,47 @@ class Trader:
 
     def disconnect(self) -> None:
         self.stop_equity_updater()
+        # Persist live-aggregated bars so a quick restart can warm up from disk
+        for symbol_name, buffers in list(self.ohlc_history.items()):
+            if not buffers['1m'].empty:
+                self._store_cached_history(symbol_name, '1m')
         if self._client:
             self._client.stopService()
         if _reactor_installed and reactor.running:
             reactor.callFromThread(reactor.stop)
         self.is_connected = False
         self._is_client_connected = False
+        self._fail_account_wait()
 
     def get_connection_status(self) -> Tuple[bool, str]:
         return self.is_connected, self._last_error
 
+    def wait_for_account_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the account is authenticated and its ID and balance are known.
+
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            True if the account details are available, False if setup failed, the connection
+            was lost or the timeout expired. get_connection_status() has the reason.
+        """
+        return self._account_ready.wait(timeout) and not self._account_failed
+
+    def register_tick_callback(self, callback: Callable[[str, float], None]) -> None:
+        """
+        Registers a callback invoked with (symbol_name, price) on every spot tick,
+        after the latest price and OHLC bars have been updated.
+        Callbacks run on the reactor thread and must return quickly.
+        """
+        # Copy-on-write so the reactor thread can iterate without locking
+        self._tick_callbacks = self._tick_callbacks + [callback]
+
+    def unregister_tick_callback(self, callback: Callable[[str, float], None]) -> None:
+        """Removes a callback previously added with register_tick_callback."""
+        self._tick_callbacks = [cb for cb in self._tick_callbacks if cb is not callback]
+
     def get_account_summary(self) -> Dict[str, Any]:
         if not USE_OPENAPI_LIB:
             return {"account_id": "MOCK", "balance": 0.0, "equity": 0.0, "margin": 0.0}
@@ -1534,12 +1795,21 @@ class Trader:
         """Returns the price history for a specific symbol."""
         return list(self.price_histories.get(symbol, []))
 
+    def get_symbol_history(self, symbol_name: str) -> Dict[str, OHLCRingBuffer]:
+        """
+        Returns the per-timeframe OHLC buffers for a symbol, creating them if needed.
+        The buffers stay the same for the symbol's lifetime, so callers may hold on to them
+        and watch their version to see newly completed bars.
+        """
+        self._initialize_data_for_symbol(symbol_name)
+        return self.ohlc_history[symbol_name]
+
     def get_ohlc_bar_counts(self, symbol_name: str) -> Dict[str, int]:
         """Returns a dictionary with the count of available OHLC bars for a specific symbol."""
         counts = {}
         if symbol_name and symbol_name in self.ohlc_history:
-            for tf_str, df_history in self.ohlc_history[symbol_name].items():
-                counts[tf_str] = len(df_history)
+            for tf_str, bars in self.ohlc_history[symbol_name].items():
+                counts[tf_str] = len(bars)
         return counts
 
     def calculate_total_pnl(self) -> float:
@@ -1692,13 +1962,52 @@ class Trader:
         if not self.ctid_trader_account_id:
             return False, "Account information not available for trading."
 
+        order = OrderReq(
+            symbol_name, volume_lots, ORDER_SIDE_BUY if side.upper() == "BUY" else ORDER_SIDE_SELL,
+            take_profit_pips, stop_loss_pips, client_msg_id=client_msg_id
+        )
+        req, message = self._build_market_order_req(order)
+        if req is None:
+            return False, message
+        return self._send_order_req(req, message)
+
+    def place_market_orders_batch(self, orders: List[OrderReq]) -> List[Tuple[bool, str]]:
+        """
+        Places several market orders in one go.
+
+        The Open API has no multi-order request, so every order is still its own
+        ProtoOANewOrderReq. The client queues each one and writes at most
+        numberOfMessagesToSendPerSecond (5 by default) per second, so a batch only saves the
+        per-call overhead here; it does not reach the broker any faster.
+
+        Args:
+            orders: The orders to place.
+
+        Returns:
+            One (success, message) tuple per order, in the same order as the input.
+        """
+        if not self.is_connected or not self._client or not self._is_client_connected:
+            return [(False, "Not connected to the trading platform.")] * len(orders)
+
+        if not self.ctid_trader_account_id:
+            return [(False, "Account information not available for trading.")] * len(orders)
+
+        built = [self._build_market_order_req(order) for order in orders]
+        return [self._send_order_req(req, message) if req is not None else (False, message) for req, message in built]
+
+    def _build_market_order_req(self, order: OrderReq) -> Tuple[Optional[Any], str]:
+        """
+        Validates an order and builds its ProtoOANewOrderReq.
+        Returns (request, description) on success or (None, error message) on failure.
+        """
+        symbol_name, volume_lots = order.symbol, order.volume
         symbol_id = self.symbols_map.get(symbol_name)
         if not symbol_id:
-            return False, f"Symbol '{symbol_name}' not found."
+            return None, f"Symbol '{symbol_name}' not found."
 
         symbol_details = self.symbol_details_map.get(symbol_id)
         if not symbol_details:
-            return False, f"Symbol details for '{symbol_name}' not loaded."
+            return None, f"Symbol details for '{symbol_name}' not loaded."
 
         # Convert volume in lots to volume in units for the API request
         volume_in_units = int(volume_lots * symbol_details.lotSize)
@@ -1724,21 +2033,24 @@ class Trader:
         req.ctidTraderAccountId = self.ctid_trader_account_id
         req.symbolId = symbol_id
         req.orderType = ProtoOAOrderType.MARKET
-        req.tradeSide = ProtoOATradeSide.BUY if side.upper() == "BUY" else ProtoOATradeSide.SELL
+        req.tradeSide = order.side
         req.volume = volume_in_units
-        req.comment = f"Market order via GUI: {volume_lots} lots"
+        req.comment = (order.comment or f"Market order via GUI: {volume_lots} lots")[:_MAX_ORDER_COMMENT_LEN]
 
-        if stop_loss_pips is not None and stop_loss_pips > 0:
+        if order.sl_pips is not None and order.sl_pips > 0:
             # Convert pips to the integer format required by the API
-            req.relativeStopLoss = int(stop_loss_pips * (10 ** symbol_details.pipPosition))
+            req.relativeStopLoss = int(order.sl_pips * (10 ** symbol_details.pipPosition))
 
-        if take_profit_pips is not None and take_profit_pips > 0:
+        if order.tp_pips is not None and order.tp_pips > 0:
             # Convert pips to the integer format required by the API
-            req.relativeTakeProfit = int(take_profit_pips * (10 ** symbol_details.pipPosition))
+            req.relativeTakeProfit = int(order.tp_pips * (10 ** symbol_details.pipPosition))
+
+        if order.client_msg_id:
+            req.clientOrderId = order.client_msg_id
 
-        if client_msg_id:
-            req.clientOrderId = client_msg_id
+        return req, f"Order request for {volume_in_units} units ({volume_lots} lots) of {symbol_name} sent."
 
+    def _send_order_req(self, req: Any, success_message: str) -> Tuple[bool, str]:
         try:
             deferred = self._client.send(req)
             # Add callbacks for logging the result of the send operation
@@ -1746,7 +2058,7 @@ class Trader:
                 lambda response: print(f"Order request sent successfully. Server Response: {response}"),
                 lambda failure: print(f"Failed to send order request. Failure: {failure}")
             )
-            return True, f"Order request for {volume_in_units} units ({volume_lots} lots) of {symbol_name} sent."
+            return True, success_message
         except Exception as e:
             traceback.print_exc() # Print full traceback for debugging
             return False, f"An exception occurred while placing the order: {e}"
@@ -1869,7 +2181,8 @@ class Trader:
         self,
         symbol_id: int,
         period: ProtoOATrendbarPeriod,
-        count: int
+        count: int,
+        from_timestamp: Optional[int] = None
     ) -> None:
         if not self._ensure_valid_token():
             return
@@ -1898,7 +2211,8 @@ class Trader:
             print(self._last_error)
             return
 
-        from_timestamp = to_timestamp - (count * period_seconds * 1000)
+        # An explicit start (UTC ms) only fetches a gap; never ask for more than count bars
+        from_timestamp = max(from_timestamp or 0, to_timestamp - (count * period_seconds * 1000))
 
         req.fromTimestamp = from_timestamp
         req.toTimestamp = to_timestamp
@@ -1968,23 +2282,26 @@ class Trader:
 
         if not processed_bars:
             print(f"No bars processed from ProtoOAGetTrendbarsRes for {tf_str}.")
+            self._store_cached_history(symbol_name, tf_str)
             return
 
         # Sort bars by timestamp just in case API doesn't guarantee it (it usually does)
         processed_bars.sort(key=lambda x: x['timestamp'])
 
-        new_df = pd.DataFrame(processed_bars)
-
-        self.ohlc_history[symbol_name][tf_str] = new_df
-        print(f"DEBUG: Populated {tf_str} OHLC history for {symbol_name} with {len(new_df)} bars. Last bar timestamp: {new_df.iloc[-1]['timestamp'] if not new_df.empty else 'N/A'}")
-
-        if not new_df.empty:
-            last_hist_bar = new_df.iloc[-1]
+        self._initialize_data_for_symbol(symbol_name)
+        # Merged rather than replaced: a gap fetch extends the cached bars, and live bars may already be in
+        self.ohlc_history[symbol_name][tf_str].merge(
+            [bar['timestamp'] for bar in processed_bars],
+            [(bar['open'], bar['high'], bar['low'], bar['close'], bar['volume']) for bar in processed_bars]
+        )
+        print(f"DEBUG: Populated {tf_str} OHLC history for {symbol_name} with {len(processed_bars)} bars. Last bar timestamp: {processed_bars[-1]['timestamp']}")
+        self._store_cached_history(symbol_name, tf_str)
 
+        if processed_bars:
             self.current_bars[tf_str] = {
                 'timestamp': None, 'open': None, 'high': None, 'low': None, 'close': None, 'volume': 0
             }
             print(f"Reset current_bar for {tf_str} to allow live aggregation post-history fetch.")
 
-        # Potentially, trigger a GUI update for data readiness explicitly here if needed,
-        # though the periodic GUI poll should pick it up.
\ No newline at end of file
+        if self.on_bars_updated:
+            self.on_bars_updated(symbol_name)
\ No newline at end of file